@@ -0,0 +1,64 @@
+"""
+Compares the Design Imprint solver with the original hourly/minute scan.
+
+Run from the backend directory:
+    python -m benchmarks.bench_design_imprint
+"""
+import time
+from datetime import datetime
+
+import pytz
+
+from human_design_lib import calculator
+from human_design_lib.models import BirthData
+
+BIRTHS = [
+    BirthData(datetime(1984, 1, 11, 12, 0, tzinfo=pytz.utc), 51.5074, 0.1278, "Europe/London"),
+    BirthData(datetime(1990, 7, 1, 3, 17, tzinfo=pytz.utc), 40.7128, -74.0060, "America/New_York"),
+    BirthData(datetime(2001, 3, 21, 23, 59, tzinfo=pytz.utc), 35.6762, 139.6503, "Asia/Tokyo"),
+    BirthData(datetime(1955, 10, 30, 1, 30, tzinfo=pytz.utc), -33.8688, 151.2093, "Australia/Sydney"),
+]
+
+
+def _run(method: str):
+    """Returns (total seconds, total Sun evaluations, results) for one method over BIRTHS."""
+    evaluations = 0
+    probes = {
+        name: getattr(calculator, name) for name in ("_get_sun_longitude_at_datetime", "_sun_longitude_fast")
+    }
+
+    def counting(probe):
+        def counting_probe(*args, **kwargs):
+            nonlocal evaluations
+            evaluations += 1
+            return probe(*args, **kwargs)
+        return counting_probe
+
+    for name, probe in probes.items():
+        setattr(calculator, name, counting(probe))
+    try:
+        start = time.perf_counter()
+        results = [calculator.calculate_design_imprint_datetime(b, method=method) for b in BIRTHS]
+        elapsed = time.perf_counter() - start
+    finally:
+        for name, probe in probes.items():
+            setattr(calculator, name, probe)
+    return elapsed, evaluations, results
+
+
+def main():
+    scan_time, scan_evals, scan_results = _run("scan")
+    solver_time, solver_evals, solver_results = _run("solver")
+
+    print(f"{'method':<8} {'charts':>6} {'sun evals':>10} {'evals/chart':>12} {'ms/chart':>10}")
+    for name, elapsed, evals in (("scan", scan_time, scan_evals), ("solver", solver_time, solver_evals)):
+        print(f"{name:<8} {len(BIRTHS):>6} {evals:>10} {evals / len(BIRTHS):>12.1f} {elapsed / len(BIRTHS) * 1000:>10.2f}")
+    print(f"speedup: {scan_time / solver_time:.1f}x")
+
+    print("\nDesign Imprint (scan vs solver):")
+    for birth, scan_dt, solver_dt in zip(BIRTHS, scan_results, solver_results):
+        print(f"  {birth.datetime_utc.isoformat()}  {scan_dt.isoformat()}  {solver_dt.isoformat()}")
+
+
+if __name__ == "__main__":
+    main()
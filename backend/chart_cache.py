@@ -0,0 +1,137 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+# Bump when the chart pipeline changes so stale on-disk entries are never served
+CHART_CACHE_VERSION = "1"
+
+# Timestamps are keyed to the second, matching the resolution of the Design Imprint solver
+KEY_TIME_RESOLUTION_SECONDS = 1
+KEY_COORDINATE_DECIMALS = 6  # ~0.1 m
+
+
+def make_chart_cache_key(datetime_utc: datetime, latitude: float, longitude: float, timezone_str: str) -> str:
+    """
+    Builds a content-addressed key for a birth: a SHA-256 of the canonical
+    (UTC instant rounded to the ephemeris resolution, lat, lon, timezone) tuple.
+    Naive datetimes are taken as UTC.
+    """
+    if datetime_utc.tzinfo is None:
+        datetime_utc = datetime_utc.replace(tzinfo=timezone.utc)
+    timestamp = int(datetime_utc.timestamp()) // KEY_TIME_RESOLUTION_SECONDS * KEY_TIME_RESOLUTION_SECONDS
+    canonical = "|".join([
+        CHART_CACHE_VERSION,
+        str(timestamp),
+        f"{latitude:.{KEY_COORDINATE_DECIMALS}f}",
+        f"{longitude:.{KEY_COORDINATE_DECIMALS}f}",
+        timezone_str,
+    ])
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ChartCache:
+    """
+    Two-tier cache of serialized chart responses keyed by make_chart_cache_key.
+
+    The memory tier is an LRU bounded by entry count and total payload size, with a TTL.
+    The optional disk tier is a SQLite file shared by every worker that points at it;
+    memory misses fall through to it and disk hits are promoted back into memory.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 24 * 3600,
+        disk_path: Optional[str] = None,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+        self._disk = None
+        if disk_path:
+            self._disk = sqlite3.connect(disk_path, check_same_thread=False, isolation_level=None)
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS chart_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                self._remove(key)
+                self._stats["expirations"] += 1
+
+            if self._disk is not None:
+                row = self._disk.execute(
+                    "SELECT value, created_at FROM chart_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl_seconds:
+                    self._insert(key, row[0], row[1])
+                    self._stats["disk_hits"] += 1
+                    return row[0]
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._insert(key, value, now)
+            if self._disk is not None:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO chart_cache (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, now),
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            if self._disk is not None:
+                self._disk.execute("DELETE FROM chart_cache")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries), "size_bytes": self._size_bytes}
+
+    # --- Helpers below expect self._lock to be held ---
+
+    def _insert(self, key: str, value: str, created_at: float) -> None:
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, created_at)
+        self._size_bytes += len(value)
+        while self._entries and (len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+            self._stats["evictions"] += 1
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._size_bytes -= len(value)
+
+
+def chart_cache_from_env() -> ChartCache:
+    """Creates the application chart cache from CHART_CACHE_* environment variables."""
+    return ChartCache(
+        max_entries=int(os.environ.get("CHART_CACHE_MAX_ENTRIES", 10_000)),
+        max_bytes=int(os.environ.get("CHART_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+        ttl_seconds=float(os.environ.get("CHART_CACHE_TTL_SECONDS", 24 * 3600)),
+        disk_path=os.environ.get("CHART_CACHE_DB_PATH") or None,
+    )
@@ -0,0 +1,94 @@
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+
+class ChartExecutorSaturated(Exception):
+    """Raised when the executor already holds max_pending calculations."""
+
+
+class ChartExecutorTimeout(Exception):
+    """Raised when a calculation does not finish within the per-request timeout."""
+
+
+class ChartExecutor:
+    """
+    Runs blocking chart calculations off the event loop on a process or thread pool.
+
+    At most max_pending calculations (running plus queued) are admitted; beyond that run()
+    fails fast with ChartExecutorSaturated so the API can shed load instead of queueing
+    without bound. A calculation that times out keeps its slot until the worker actually
+    finishes, so timeouts never admit more work than the pool can hold.
+    """
+
+    def __init__(
+        self,
+        kind: str = "process",
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout_seconds: float = 30.0,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        if kind not in ("process", "thread"):
+            raise ValueError(f"Unknown chart executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        self.timeout_seconds = timeout_seconds
+        self._initializer = initializer
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        # Created on first use so importing the app never forks worker processes
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, initializer=self._initializer)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="chart", initializer=self._initializer
+                )
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Runs fn(*args) on the pool and returns its result, re-raising its exceptions."""
+        if self._pending >= self.max_pending:
+            raise ChartExecutorSaturated()
+
+        self._pending += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._get_executor(), fn, *args)
+        future.add_done_callback(self._release)
+        try:
+            # shield() keeps the pool future alive on timeout so _release fires when it really ends
+            return await asyncio.wait_for(asyncio.shield(future), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            raise ChartExecutorTimeout()
+
+    def _release(self, future: "asyncio.Future[Any]") -> None:
+        self._pending -= 1
+        if not future.cancelled():
+            future.exception() # Mark as retrieved when the caller already timed out
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def chart_executor_from_env(initializer: Optional[Callable[[], None]] = None) -> ChartExecutor:
+    """Creates the application chart executor from CHART_EXECUTOR* environment variables."""
+    max_workers = os.environ.get("CHART_EXECUTOR_WORKERS")
+    max_pending = os.environ.get("CHART_EXECUTOR_MAX_PENDING")
+    return ChartExecutor(
+        kind=os.environ.get("CHART_EXECUTOR", "process"),
+        max_workers=int(max_workers) if max_workers else None,
+        max_pending=int(max_pending) if max_pending else None,
+        timeout_seconds=float(os.environ.get("CHART_EXECUTOR_TIMEOUT_SECONDS", 30)),
+        initializer=initializer,
+    )
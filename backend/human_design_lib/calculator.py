@@ -1,17 +1,46 @@
+import math
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import numpy as np
 import pytz
 from kerykeion import AstrologicalSubjectFactory # Changed from AstrologicalSubject
 from kerykeion.schemas.kerykeion_exception import KerykeionException # Import KerykeionException
 
+from human_design_lib.imprint_memo import DesignImprintMemo
+from human_design_lib.sun_table import DEFAULT_SUN_TABLE_PATH, SunTable, load_sun_table
 from human_design_lib.models import BirthData, PlanetaryPosition, Planet, Gate, Line, GateActivation
-from human_design_lib.gate_mapping import GATE_DEGREE_MAPPING, LINE_MAPPING, GATE_WIDTH
+from human_design_lib.gate_mapping import (
+    LINE_INDEX_BOUNDARIES_ARRAY,
+    LINE_INDEX_GATE_NUMBERS,
+    LINE_INDEX_LINE_NUMBERS,
+    lookup_gate_and_line,
+)
+from human_design_lib.ephemeris import (
+    SWISSEPH_BODIES,
+    datetime_to_julian_day,
+    datetimes64_to_julian_days,
+    planet_longitude,
+    sun_longitude,
+)
 
 ZODIAC_SIGN_START_DEGREES = {
     "Ari": 0, "Tau": 30, "Gem": 60, "Can": 90, "Leo": 120, "Vir": 150,
     "Lib": 180, "Sco": 210, "Sag": 240, "Cap": 270, "Aqu": 300, "Pis": 330
 }
 
+# Column layout of get_planetary_positions_batch: one column per Planet, in enum order
+PLANET_COLUMNS = tuple(Planet)
+PLANET_COLUMN = {planet: column for column, planet in enumerate(PLANET_COLUMNS)}
+SWISSEPH_COLUMNS = tuple((PLANET_COLUMN[planet], body) for planet, body in SWISSEPH_BODIES.items())
+
+DESIGN_SOLAR_ARC = 88.0 # degrees of solar arc between the Design and Personality imprints
+MEAN_SOLAR_MOTION = 0.9856 # mean apparent motion of the Sun, degrees per day
+SOLAR_MOTION_PER_SECOND = 1.02 / 86400 # upper bound of the Sun's motion in one second, degrees
+DESIGN_IMPRINT_PRECISION_ARCSEC = 1.0 # default solver precision for the Design Imprint
+
+_design_imprint_memo = DesignImprintMemo() # in-memory only until configure_design_imprint_memo is called
+_sun_table = load_sun_table() # None until `python -m human_design_lib.sun_table` has built it
+
 def degree_to_zodiac_sign(degree: float) -> str:
     """Converts a degree (0-360) to its corresponding zodiac sign."""
     # Zodiac signs start at 0 Aries
@@ -84,24 +113,21 @@ def get_planetary_positions(birth_data: BirthData) -> List[PlanetaryPosition]:
         "Uranus": Planet.URANUS,
         "Neptune": Planet.NEPTUNE,
         "Pluto": Planet.PLUTO,
-        "True Node": Planet.NORTH_NODE,
-        "South Node": Planet.SOUTH_NODE,
+        "True North Lunar Node": Planet.NORTH_NODE,
+        "True South Lunar Node": Planet.SOUTH_NODE,
     }
 
     for planet_name, planet_enum in planet_mapping.items():
         kerykeion_name = planet_name.lower().replace(" ", "_")
-        # Handle True Node as 'north_node' in kerykeion subject attribute
-        if kerykeion_name == "true_node":
-            kerykeion_name = "north_node"
 
         if hasattr(subject, kerykeion_name):
             planet_data = getattr(subject, kerykeion_name)
             # Access attributes directly, not dictionary keys
-            if hasattr(planet_data, 'position') and hasattr(planet_data, 'sign'):
+            if hasattr(planet_data, 'abs_pos') and hasattr(planet_data, 'sign'):
                 positions.append(PlanetaryPosition(
                     planet=planet_enum,
-                    degree=float(planet_data.position), # Changed from planet_data['degree']
-                    sign=planet_data.sign # Changed from planet_data['sign']
+                    degree=float(planet_data.abs_pos), # Absolute longitude; .position is within the sign
+                    sign=planet_data.sign
                 ))
 
     # Calculate Earth's position (opposite the Sun)
@@ -118,9 +144,163 @@ def get_planetary_positions(birth_data: BirthData) -> List[PlanetaryPosition]:
     return positions
 
 
-def calculate_design_imprint_datetime(birth_data: BirthData) -> datetime:
+def get_planetary_positions_batch(timestamps_utc) -> np.ndarray:
+    """
+    Calculates absolute longitudes (0-360) of all planets for many UTC instants at once.
+
+    timestamps_utc may be a NumPy datetime64 array or any sequence of datetimes (naive values
+    are taken as UTC). Returns an (N, 13) float matrix whose columns follow PLANET_COLUMNS,
+    i.e. the order of the Planet enum, with Earth and South Node derived from Sun and North Node.
+    Unlike get_planetary_positions, no kerykeion subject is built, so the timestamps are
+    never reinterpreted in a local timezone.
+    """
+    if not isinstance(timestamps_utc, np.ndarray):
+        # datetime64 has no timezone support, so aware datetimes are normalized to naive UTC first
+        timestamps_utc = [
+            ts.astimezone(pytz.utc).replace(tzinfo=None) if ts.tzinfo is not None else ts
+            for ts in timestamps_utc
+        ]
+    julian_days = datetimes64_to_julian_days(np.asarray(timestamps_utc, dtype="datetime64[us]"))
+    longitudes = np.empty((len(julian_days), len(PLANET_COLUMNS)), dtype=np.float64)
+
+    for row, jd in enumerate(julian_days.tolist()):
+        for column, body in SWISSEPH_COLUMNS:
+            longitudes[row, column] = planet_longitude(jd, body)
+
+    longitudes[:, PLANET_COLUMN[Planet.EARTH]] = (longitudes[:, PLANET_COLUMN[Planet.SUN]] + 180) % 360
+    longitudes[:, PLANET_COLUMN[Planet.SOUTH_NODE]] = (longitudes[:, PLANET_COLUMN[Planet.NORTH_NODE]] + 180) % 360
+    return longitudes
+
+
+def configure_design_imprint_memo(path: Optional[str] = None, max_entries: int = 100_000) -> DesignImprintMemo:
+    """
+    Replaces the Design Imprint memo used by calculate_design_imprint_datetime.
+    With a path, solutions persist in that SQLite file and are shared by every process using it.
+    """
+    global _design_imprint_memo
+    _design_imprint_memo = DesignImprintMemo(path=path, max_entries=max_entries)
+    return _design_imprint_memo
+
+
+def configure_sun_table(path: Optional[str] = DEFAULT_SUN_TABLE_PATH) -> Optional[SunTable]:
+    """
+    Memory-maps the precomputed Sun-longitude table at path (None disables it).
+    While a table is loaded, Sun queries inside its range never call the ephemeris.
+    """
+    global _sun_table
+    _sun_table = load_sun_table(path) if path else None
+    return _sun_table
+
+
+def _sun_longitude_fast(jd: float) -> float:
+    """Sun longitude from the precomputed table when it covers jd, else from Swiss Ephemeris."""
+    if _sun_table is not None and _sun_table.covers(jd):
+        return _sun_table.longitude(jd)
+    return sun_longitude(jd)
+
+
+def _get_sun_longitude_safe(dt_utc: datetime, latitude: float, longitude: float, timezone_str: str) -> float:
+    """Like _get_sun_longitude_at_datetime, but falls back to UTC for ambiguous (DST) local times."""
+    try:
+        return _get_sun_longitude_at_datetime(dt_utc, latitude, longitude, timezone_str)
+    except KerykeionException as e:
+        if "Ambiguous time error" in str(e):
+            return _get_sun_longitude_at_datetime(dt_utc, latitude, longitude, "UTC")
+        raise e
+
+
+def _signed_angular_difference(a: float, b: float) -> float:
+    """Returns a - b wrapped into [-180, 180) degrees."""
+    return (a - b + 180.0) % 360.0 - 180.0
+
+
+def _solve_design_imprint_datetime(
+    birth_data: BirthData,
+    precision_arcsec: float = DESIGN_IMPRINT_PRECISION_ARCSEC,
+    max_evaluations: int = 10,
+) -> datetime:
+    """
+    Finds the Design Imprint datetime as the root of f(t) = sun(t) - (sun(birth) - 88).
+
+    The Sun's geocentric longitude increases monotonically, so f is monotonic over the
+    search window. The first step is a Newton step seeded with the mean solar motion
+    (~0.9856 deg/day); later steps are secant steps, safeguarded by bisection whenever
+    an iterate leaves the bracket [birth - 93 days, birth - 86 days].
+    Sun positions come from the Sun table or ephemeris.sun_longitude (see _sun_longitude_fast),
+    so location and timezone are not used.
+    """
+    birth_jd = datetime_to_julian_day(birth_data.datetime_utc)
+    target_sun_longitude = (_sun_longitude_fast(birth_jd) - DESIGN_SOLAR_ARC) % 360
+    tolerance = precision_arcsec / 3600.0
+    evaluations = 1
+
+    def f(days: float) -> float:
+        return _signed_angular_difference(_sun_longitude_fast(birth_jd + days), target_sun_longitude)
+
+    # Offsets are in days relative to birth; the solar arc of 88 degrees always takes 86-93 days.
+    lower, upper = -93.0, -86.0
+    t_prev = -DESIGN_SOLAR_ARC / MEAN_SOLAR_MOTION
+    f_prev = f(t_prev)
+    evaluations += 1
+    t_curr = t_prev - f_prev / MEAN_SOLAR_MOTION
+    best_t, best_f = t_prev, f_prev
+
+    while evaluations < max_evaluations and abs(best_f) > tolerance:
+        if not lower < t_curr < upper:
+            t_curr = (lower + upper) / 2
+        f_curr = f(t_curr)
+        evaluations += 1
+
+        if abs(f_curr) < abs(best_f):
+            best_t, best_f = t_curr, f_curr
+        if f_curr < 0:
+            lower = max(lower, t_curr)
+        else:
+            upper = min(upper, t_curr)
+
+        if f_curr == f_prev:
+            t_next = t_curr - f_curr / MEAN_SOLAR_MOTION
+        else:
+            t_next = t_curr - f_curr * (t_curr - t_prev) / (f_curr - f_prev)
+        if abs(t_next - t_curr) * 86400 < 0.5:
+            break
+        t_prev, f_prev, t_curr = t_curr, f_curr, t_next
+
+    if abs(best_f) > max(tolerance, SOLAR_MOTION_PER_SECOND):
+        raise ValueError("Could not find Design Imprint datetime with required precision.")
+
+    design_dt = birth_data.datetime_utc + timedelta(days=best_t)
+    return design_dt.replace(microsecond=0) + timedelta(seconds=round(design_dt.microsecond / 1e6))
+
+
+def calculate_design_imprint_datetime(
+    birth_data: BirthData,
+    method: str = "solver",
+    precision_arcsec: float = DESIGN_IMPRINT_PRECISION_ARCSEC,
+) -> datetime:
     """
     Calculates the datetime for the Design Imprint (88 degrees solar arc before birth).
+
+    method="solver" (default) finds the instant with a bracketed Newton/secant search in a
+    handful of ephemeris evaluations, to within precision_arcsec of solar arc. Solutions are
+    memoized per birth instant (see configure_design_imprint_memo).
+    method="scan" uses the original hourly/minute scan and ignores precision_arcsec.
+    """
+    if method == "solver":
+        design_dt = _design_imprint_memo.get(birth_data.datetime_utc, precision_arcsec)
+        if design_dt is None:
+            design_dt = _solve_design_imprint_datetime(birth_data, precision_arcsec=precision_arcsec)
+            _design_imprint_memo.set(birth_data.datetime_utc, precision_arcsec, design_dt)
+        return design_dt
+    if method == "scan":
+        return _scan_design_imprint_datetime(birth_data)
+    raise ValueError(f"Unknown design imprint method: {method}")
+
+
+def _scan_design_imprint_datetime(birth_data: BirthData) -> datetime:
+    """
+    Finds the Design Imprint datetime with an hourly scan followed by a minute-level refinement.
+    Kept as the reference implementation for the solver; it needs up to ~1800 Sun evaluations.
     """
     initial_sun_longitude = _get_sun_longitude_at_datetime(
         birth_data.datetime_utc,
@@ -235,40 +415,26 @@ def calculate_design_imprint_datetime(birth_data: BirthData) -> datetime:
 def map_degree_to_gate_and_line(degree: float) -> Tuple[Gate, Line]:
     """
     Maps an absolute zodiac degree (0-360) to a Human Design Gate and Line.
-    Uses the GATE_DEGREE_MAPPING and LINE_MAPPING from gate_mapping.py.
+    Uses the line index precomputed from GATE_DEGREE_MAPPING and LINE_MAPPING in gate_mapping.py,
+    so a lookup is a single bisect. Degrees of 360 and above wrap around.
     """
-    target_gate = None
-    gate_start_degree = 0.0
-
-    # Find the gate
-    for start_deg, end_deg, gate_enum in GATE_DEGREE_MAPPING:
-        if start_deg <= degree < end_deg:
-            target_gate = gate_enum
-            gate_start_degree = start_deg
-            break
-    
-    if target_gate is None:
-        # Handle wrap-around for 360 degrees
-        if degree >= 360.0 and GATE_DEGREE_MAPPING[0][0] <= (degree % 360) < GATE_DEGREE_MAPPING[0][1]:
-            target_gate = GATE_DEGREE_MAPPING[0][2]
-            gate_start_degree = GATE_DEGREE_MAPPING[0][0]
-        else:
-            raise ValueError(f"Degree {degree} out of mapped gate range.")
-
-    # Calculate relative degree within the found gate
-    relative_degree_in_gate = degree - gate_start_degree
-    
-    # Find the line
-    target_line = None
-    # We use the fixed GATE_WIDTH and LINE_WIDTH for simulated mapping
-    # In a real scenario, each gate might have a slightly different width.
-    line_index = int(relative_degree_in_gate / (GATE_WIDTH / 6))
-    target_line = getattr(Line, f"LINE_{min(line_index + 1, 6)}") # Ensure line index is within 1-6
+    if not (math.isfinite(degree) and degree >= 0.0):
+        raise ValueError(f"Degree {degree} out of mapped gate range.")
+    return lookup_gate_and_line(degree % 360)
 
-    if target_line is None:
-        raise ValueError(f"Could not determine line for degree {degree} within gate {target_gate.value}.\n")
 
-    return target_gate, target_line
+def map_degrees_to_gates_and_lines(degrees: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized map_degree_to_gate_and_line: maps an array of absolute zodiac degrees to
+    arrays of gate numbers (1-64) and line numbers (1-6) of the same shape.
+    """
+    degrees = np.asarray(degrees, dtype=np.float64)
+    if not np.all((degrees >= 0.0) & np.isfinite(degrees)):
+        raise ValueError("Degrees out of mapped gate range.")
+    segments = np.searchsorted(LINE_INDEX_BOUNDARIES_ARRAY, degrees % 360, side="right") - 1
+    # Index -1 (below the first boundary) belongs to the last segment, which wraps past 360
+    segments %= len(LINE_INDEX_BOUNDARIES_ARRAY)
+    return LINE_INDEX_GATE_NUMBERS[segments], LINE_INDEX_LINE_NUMBERS[segments]
 
 
 # Example Usage (for testing during development)
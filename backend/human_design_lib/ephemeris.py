@@ -0,0 +1,74 @@
+"""
+Lightweight Swiss Ephemeris access for the hot paths of the calculator.
+
+Building a kerykeion AstrologicalSubject computes every planet, the houses and a
+timezone conversion; the Design Imprint search only needs the Sun. The functions here
+call pyswisseph (which kerykeion already depends on) directly with the same flags
+kerykeion uses for a tropical, geocentric chart, so the longitudes are identical.
+
+Precision: with the Swiss Ephemeris data files the Sun is accurate to ~0.001 arc-seconds.
+kerykeion only bundles asteroid files, so by default the Moshier analytical ephemeris is
+used, which is accurate to better than 1 arc-second for the Sun between 3000 BC and 3000 AD.
+"""
+import importlib.util
+import os
+from datetime import datetime
+
+import numpy as np
+import pytz
+import swisseph as swe
+
+from human_design_lib.models import Planet
+
+EPHEMERIS_FLAGS = swe.FLG_SWIEPH
+UNIX_EPOCH_JULIAN_DAY = 2440587.5
+
+# Swiss Ephemeris body ids for the planets that are computed directly.
+# Earth and the South Node are derived (Sun + 180, North Node + 180).
+SWISSEPH_BODIES = {
+    Planet.SUN: swe.SUN,
+    Planet.MOON: swe.MOON,
+    Planet.MERCURY: swe.MERCURY,
+    Planet.VENUS: swe.VENUS,
+    Planet.MARS: swe.MARS,
+    Planet.JUPITER: swe.JUPITER,
+    Planet.SATURN: swe.SATURN,
+    Planet.URANUS: swe.URANUS,
+    Planet.NEPTUNE: swe.NEPTUNE,
+    Planet.PLUTO: swe.PLUTO,
+    Planet.NORTH_NODE: swe.TRUE_NODE,
+}
+
+def _kerykeion_ephemeris_path() -> str:
+    """Locates the ephemeris directory bundled with kerykeion without importing it."""
+    spec = importlib.util.find_spec("kerykeion")
+    if spec is None or not spec.submodule_search_locations:
+        return ""
+    return os.path.join(list(spec.submodule_search_locations)[0], "sweph")
+
+EPHEMERIS_PATH = _kerykeion_ephemeris_path()
+swe.set_ephe_path(EPHEMERIS_PATH)
+
+
+def datetime_to_julian_day(dt_utc: datetime) -> float:
+    """Converts a UTC datetime (naive datetimes are taken as UTC) to a Julian day (UT)."""
+    if dt_utc.tzinfo is not None:
+        dt_utc = dt_utc.astimezone(pytz.utc)
+    hour = dt_utc.hour + dt_utc.minute / 60 + (dt_utc.second + dt_utc.microsecond / 1e6) / 3600
+    return swe.julday(dt_utc.year, dt_utc.month, dt_utc.day, hour, swe.GREG_CAL)
+
+
+def datetimes64_to_julian_days(timestamps: np.ndarray) -> np.ndarray:
+    """Converts an array of UTC datetime64 values to Julian days (UT)."""
+    microseconds = (timestamps.astype("datetime64[us]") - np.datetime64(0, "us")).astype(np.int64)
+    return UNIX_EPOCH_JULIAN_DAY + microseconds / 86_400_000_000
+
+
+def planet_longitude(jd: float, body: int) -> float:
+    """Returns the absolute tropical ecliptic longitude (0-360) of a Swiss Ephemeris body at jd (UT)."""
+    return swe.calc_ut(jd, body, EPHEMERIS_FLAGS)[0][0]
+
+
+def sun_longitude(jd: float) -> float:
+    """Returns the Sun's absolute tropical ecliptic longitude (0-360) at Julian day jd (UT)."""
+    return swe.calc_ut(jd, swe.SUN, EPHEMERIS_FLAGS)[0][0]
@@ -1,3 +1,8 @@
+from bisect import bisect_right
+from typing import Dict, List, Tuple
+
+import numpy as np
+
 from human_design_lib.models import Gate, Line
 
 # Helper function to convert astrological degree (e.g., Aries 15°07'30") to absolute degree (0-360)
@@ -34,6 +39,35 @@ for gate_enum in Gate:
         line = getattr(Line, f"LINE_{i + 1}")
         LINE_MAPPING[gate_enum].append((start_line_degree, end_line_degree, line))
 
+
+def build_line_index(
+    gate_degree_mapping: List[Tuple[float, float, Gate]],
+    line_mapping: Dict[Gate, List[Tuple[float, float, Line]]],
+) -> Tuple[List[float], List[Tuple[Gate, Line]]]:
+    """
+    Flattens a gate mapping and its per-gate line mapping into one sorted table of the
+    absolute start degree of every (gate, line) segment, for bisect lookups.
+    Works for non-uniform mappings; a last segment that wraps past 360 degrees is matched
+    by degrees below the first boundary (bisect index -1).
+    """
+    segments = []
+    for gate_start, _gate_end, gate_enum in gate_degree_mapping:
+        for line_start, _line_end, line_enum in line_mapping[gate_enum]:
+            segments.append(((gate_start + line_start) % 360, gate_enum, line_enum))
+    segments.sort(key=lambda segment: segment[0])
+    return [start for start, _, _ in segments], [(gate, line) for _, gate, line in segments]
+
+# Precomputed lookup tables for map_degree_to_gate_and_line and its vectorized variant
+LINE_INDEX_BOUNDARIES, LINE_INDEX_ACTIVATIONS = build_line_index(GATE_DEGREE_MAPPING, LINE_MAPPING)
+LINE_INDEX_BOUNDARIES_ARRAY = np.array(LINE_INDEX_BOUNDARIES, dtype=np.float64)
+LINE_INDEX_GATE_NUMBERS = np.array([gate.value[0] for gate, _ in LINE_INDEX_ACTIVATIONS], dtype=np.int8)
+LINE_INDEX_LINE_NUMBERS = np.array([line.value for _, line in LINE_INDEX_ACTIVATIONS], dtype=np.int8)
+
+
+def lookup_gate_and_line(degree: float) -> Tuple[Gate, Line]:
+    """Bisects the precomputed line index for a degree already normalized to [0, 360)."""
+    return LINE_INDEX_ACTIVATIONS[bisect_right(LINE_INDEX_BOUNDARIES, degree) - 1]
+
 # The more accurate mapping, if available, would be structured like this:
 # GATE_DEGREE_MAPPING_ACCURATE = [
 #     (to_absolute_degree("Aries", 0, 0, 0), to_absolute_degree("Aries", 3, 52, 30), Gate.GATE_25),
@@ -0,0 +1,85 @@
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+import pytz
+
+
+class DesignImprintMemo:
+    """
+    Memo of Design Imprint solutions keyed by the birth instant.
+
+    The solver only reads the geocentric Sun, so the result depends on the UTC birth instant
+    and the requested precision, never on location or timezone. Entries are kept in a bounded
+    in-memory LRU and, when path is given, in a SQLite file that restarts and every worker
+    process pointing at the same file share.
+
+    Values are stored as the offset from birth, so a hit returns a datetime with the same
+    tzinfo (or naivety) as the birth datetime, exactly as the solver would.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[int, float], int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS design_imprints ("
+                "birth_us INTEGER NOT NULL, precision_arcsec REAL NOT NULL, offset_us INTEGER NOT NULL, "
+                "PRIMARY KEY (birth_us, precision_arcsec))"
+            )
+
+    @staticmethod
+    def _key(birth_dt_utc: datetime, precision_arcsec: float) -> "tuple[int, float]":
+        if birth_dt_utc.tzinfo is None:
+            birth_dt_utc = pytz.utc.localize(birth_dt_utc)
+        birth_us = (birth_dt_utc - datetime(1970, 1, 1, tzinfo=pytz.utc)) // timedelta(microseconds=1)
+        return birth_us, float(precision_arcsec)
+
+    def get(self, birth_dt_utc: datetime, precision_arcsec: float) -> Optional[datetime]:
+        key = self._key(birth_dt_utc, precision_arcsec)
+        with self._lock:
+            offset_us = self._entries.get(key)
+            if offset_us is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute(
+                    "SELECT offset_us FROM design_imprints WHERE birth_us = ? AND precision_arcsec = ?", key
+                ).fetchone()
+                if row is not None:
+                    offset_us = row[0]
+                    self._remember(key, offset_us)
+        if offset_us is None:
+            return None
+        return birth_dt_utc + timedelta(microseconds=offset_us)
+
+    def set(self, birth_dt_utc: datetime, precision_arcsec: float, design_dt_utc: datetime) -> None:
+        key = self._key(birth_dt_utc, precision_arcsec)
+        offset_us = (design_dt_utc - birth_dt_utc) // timedelta(microseconds=1)
+        with self._lock:
+            self._remember(key, offset_us)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR IGNORE INTO design_imprints (birth_us, precision_arcsec, offset_us) VALUES (?, ?, ?)",
+                    (*key, offset_us),
+                )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM design_imprints")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remember(self, key: "tuple[int, float]", offset_us: int) -> None:
+        self._entries[key] = offset_us
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -1,5 +1,10 @@
+import os
+import tempfile
 import unittest
+from bisect import bisect_right
 from datetime import datetime
+from unittest import mock
+import numpy as np
 import pytz
 
 from human_design_lib.models import (
@@ -10,9 +15,17 @@ from human_design_lib.calculator import (
     _get_kerykeion_subject,
     _get_sun_longitude_at_datetime,
     get_planetary_positions,
+    get_planetary_positions_batch,
+    PLANET_COLUMN,
     calculate_design_imprint_datetime,
-    map_degree_to_gate_and_line
+    configure_design_imprint_memo,
+    configure_sun_table,
+    map_degree_to_gate_and_line,
+    map_degrees_to_gates_and_lines
 )
+from human_design_lib.gate_mapping import GATE_DEGREE_MAPPING, LINE_MAPPING, build_line_index
+from human_design_lib.ephemeris import datetime_to_julian_day, sun_longitude
+from human_design_lib.sun_table import SUN_TABLE_MAX_ERROR_ARCSEC, build_sun_table, verify_sun_table
 from human_design_lib.bodygraph import calculate_defined_channels, calculate_defined_centers
 from human_design_lib.chart_analyzer import (
     determine_type_and_strategy,
@@ -35,6 +48,8 @@ class TestHumanDesignLib(unittest.TestCase):
         self.london_lat = 51.5074
         self.london_lon = 0.1278
         self.london_tz = "Europe/London"
+        configure_design_imprint_memo() # Start every test with an empty in-memory memo
+        configure_sun_table(None) # and with Sun positions straight from the ephemeris
 
     def test_degree_to_zodiac_sign(self):
         self.assertEqual(degree_to_zodiac_sign(15), "Aries")
@@ -67,6 +82,14 @@ class TestHumanDesignLib(unittest.TestCase):
         self.assertGreater(sun_lon, 270)
         self.assertLess(sun_lon, 300)
 
+    def test_sun_longitude_matches_kerykeion(self):
+        for dt in [self.birth_data.datetime_utc, datetime(1900, 3, 1, 6, 45, tzinfo=pytz.utc), datetime(2099, 8, 17, 23, 5, tzinfo=pytz.utc)]:
+            jd = datetime_to_julian_day(dt)
+            self.assertIsInstance(jd, float)
+            # A UTC subject makes kerykeion's local-time interpretation a no-op
+            expected = _get_sun_longitude_at_datetime(dt, self.london_lat, self.london_lon, "UTC")
+            self.assertAlmostEqual(sun_longitude(jd), expected, places=9)
+
     def test_get_planetary_positions(self):
         positions = get_planetary_positions(self.birth_data)
         self.assertIsInstance(positions, list)
@@ -82,6 +105,23 @@ class TestHumanDesignLib(unittest.TestCase):
                 break
         self.assertTrue(earth_present)
 
+    def test_get_planetary_positions_batch(self):
+        timestamps = [self.birth_data.datetime_utc, datetime(1950, 6, 3, 17, 42, tzinfo=pytz.utc)]
+        longitudes = get_planetary_positions_batch(timestamps)
+        self.assertEqual(longitudes.shape, (2, len(Planet)))
+        self.assertTrue(((longitudes >= 0) & (longitudes < 360)).all())
+
+        for row, dt in enumerate(timestamps):
+            # UTC timezone so the kerykeion subject reads the same instant as the batch path
+            positions = get_planetary_positions(BirthData(dt, self.london_lat, self.london_lon, "UTC"))
+            self.assertEqual(len(positions), len(Planet))
+            for p in positions:
+                self.assertAlmostEqual(longitudes[row, PLANET_COLUMN[p.planet]], p.degree, places=9)
+
+        # NumPy datetime64 input gives the same result
+        as_datetime64 = np.array(["1984-01-11T12:00", "1950-06-03T17:42"], dtype="datetime64[m]")
+        np.testing.assert_allclose(get_planetary_positions_batch(as_datetime64), longitudes)
+
     def test_calculate_design_imprint_datetime(self):
         design_dt = calculate_design_imprint_datetime(self.birth_data)
         self.assertIsInstance(design_dt, datetime)
@@ -92,6 +132,64 @@ class TestHumanDesignLib(unittest.TestCase):
         diff = (initial_sun_lon - design_sun_lon + 360) % 360
         self.assertAlmostEqual(diff, 88.0, delta=0.1) # Allowing a small delta for iterative search accuracy
 
+    def test_design_imprint_solver_matches_scan(self):
+        # The scan reads the UTC wall-clock in the birth timezone, so compare them on a UTC birth
+        utc_birth_data = BirthData(self.birth_data.datetime_utc, self.london_lat, self.london_lon, "UTC")
+        solver_dt = calculate_design_imprint_datetime(utc_birth_data)
+        scan_dt = calculate_design_imprint_datetime(utc_birth_data, method="scan")
+        # The scan stops at 0.01 degrees (~15 minutes of solar motion); the solver is tighter.
+        self.assertLess(abs((solver_dt - scan_dt).total_seconds()), 20 * 60)
+
+        initial_sun_lon = sun_longitude(datetime_to_julian_day(self.birth_data.datetime_utc))
+        design_sun_lon = sun_longitude(datetime_to_julian_day(solver_dt))
+        diff = (initial_sun_lon - design_sun_lon + 360) % 360
+        self.assertAlmostEqual(diff, 88.0, delta=1 / 3600)
+
+    def test_design_imprint_solver_evaluation_count(self):
+        with mock.patch("human_design_lib.calculator.sun_longitude", wraps=sun_longitude) as probe:
+            calculate_design_imprint_datetime(self.birth_data)
+        self.assertLess(probe.call_count, 10)
+
+        with self.assertRaises(ValueError):
+            calculate_design_imprint_datetime(self.birth_data, method="bogus")
+
+    def test_design_imprint_memo(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "design_imprints.db")
+            configure_design_imprint_memo(path=path)
+            design_dt = calculate_design_imprint_datetime(self.birth_data)
+
+            # A new process (fresh memo on the same file) and another location reuse the solution
+            configure_design_imprint_memo(path=path)
+            elsewhere = BirthData(self.birth_data.datetime_utc, -33.8688, 151.2093, "Australia/Sydney")
+            with mock.patch("human_design_lib.calculator.sun_longitude", wraps=sun_longitude) as probe:
+                self.assertEqual(calculate_design_imprint_datetime(elsewhere), design_dt)
+                self.assertEqual(probe.call_count, 0)
+                # A different precision target is solved separately
+                calculate_design_imprint_datetime(self.birth_data, precision_arcsec=0.5)
+                self.assertGreater(probe.call_count, 0)
+            configure_design_imprint_memo()
+
+    def test_sun_table(self):
+        ephemeris_dt = calculate_design_imprint_datetime(self.birth_data)
+        configure_design_imprint_memo()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sun.bin")
+            start_jd = datetime_to_julian_day(datetime(1983, 9, 1, tzinfo=pytz.utc))
+            build_sun_table(path, start_jd=start_jd, end_jd=start_jd + 200)
+            table = configure_sun_table(path)
+            self.assertIsInstance(table.samples, np.memmap)
+            self.assertLess(verify_sun_table(table, samples=2000), SUN_TABLE_MAX_ERROR_ARCSEC)
+            with self.assertRaises(ValueError):
+                table.longitude(start_jd - 1)
+
+            with mock.patch("human_design_lib.calculator.sun_longitude", wraps=sun_longitude) as probe:
+                table_dt = calculate_design_imprint_datetime(self.birth_data)
+            self.assertEqual(probe.call_count, 0) # Answered entirely from the table
+            self.assertLessEqual(abs((table_dt - ephemeris_dt).total_seconds()), 1)
+            del table
+            configure_sun_table(None)
+
     def test_map_degree_to_gate_and_line(self):
         # Test within a gate
         gate, line = map_degree_to_gate_and_line(10.0) # Within GATE_25 (approx 0-5.625) or GATE_17 (approx 5.625-11.25)
@@ -114,6 +212,37 @@ class TestHumanDesignLib(unittest.TestCase):
         self.assertEqual(gate_wrap, Gate.GATE_64)
         self.assertEqual(line_wrap, Line.LINE_6)
 
+        with self.assertRaises(ValueError):
+            map_degree_to_gate_and_line(-0.5)
+
+    def test_map_degree_to_gate_and_line_matches_linear_scan(self):
+        degrees = np.concatenate([np.linspace(0, 360, 5000, endpoint=False), [start for start, _, _ in GATE_DEGREE_MAPPING]])
+        gate_numbers, line_numbers = map_degrees_to_gates_and_lines(degrees)
+        self.assertEqual(gate_numbers.shape, degrees.shape)
+        for degree, gate_number, line_number in zip(degrees, gate_numbers, line_numbers):
+            gate, line = map_degree_to_gate_and_line(degree)
+            for start_deg, end_deg, gate_enum in GATE_DEGREE_MAPPING:
+                if start_deg <= degree < end_deg:
+                    expected_line = next(l for s, e, l in LINE_MAPPING[gate_enum] if s <= degree - start_deg < e)
+                    self.assertEqual((gate, line), (gate_enum, expected_line))
+            self.assertEqual((gate_number, line_number), (gate.value[0], line.value))
+
+    def test_build_line_index_wraps_non_uniform_mapping(self):
+        # A non-uniform mapping whose last line straddles 0 degrees, as the accurate Rave mandala does
+        mapping = [(0.5, 356.5, Gate.GATE_25), (356.5, 360.5, Gate.GATE_17)]
+        lines = {
+            Gate.GATE_25: [(i * 356 / 6, (i + 1) * 356 / 6, line) for i, line in enumerate(Line)],
+            Gate.GATE_17: [(i * 4 / 6, (i + 1) * 4 / 6, line) for i, line in enumerate(Line)],
+        }
+        boundaries, activations = build_line_index(mapping, lines)
+        self.assertEqual(boundaries, sorted(boundaries))
+
+        def lookup(degree):
+            return activations[bisect_right(boundaries, degree) - 1]
+
+        self.assertEqual(lookup(0.2), (Gate.GATE_17, Line.LINE_6)) # Below the first boundary wraps to the last segment
+        self.assertEqual(lookup(0.5), (Gate.GATE_25, Line.LINE_1))
+        self.assertEqual(lookup(357.0), (Gate.GATE_17, Line.LINE_1))
 
     def test_calculate_defined_channels(self):
         # Gates 64 and 47 form a channel
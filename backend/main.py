@@ -1,7 +1,12 @@
+import asyncio
+import codecs
+import csv
 import os
-from fastapi import FastAPI, HTTPException, Depends, status
-from pydantic import BaseModel
-from typing import List, Optional
+from collections import deque
+from fastapi import FastAPI, HTTPException, Depends, Request, status
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
 from datetime import datetime
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session # Import Session
@@ -10,6 +15,8 @@ import json # Import json for chart_data_json serialization
 
 from database import engine, SessionLocal, get_db # Import from new database.py
 from models import Base, UserManifesto # Import Base and UserManifesto from new models.py
+from chart_cache import chart_cache_from_env, make_chart_cache_key
+from chart_executor import ChartExecutorSaturated, ChartExecutorTimeout, chart_executor_from_env
 
 # Import Human Design Library components (data structures and calculation logic)
 from human_design_lib.models import (
@@ -26,6 +33,7 @@ from human_design_lib.models import (
 from human_design_lib.calculator import (
     get_planetary_positions,
     calculate_design_imprint_datetime,
+    configure_design_imprint_memo,
     map_degree_to_gate_and_line
 )
 from human_design_lib.bodygraph import calculate_defined_channels, calculate_defined_centers
@@ -249,12 +257,32 @@ class ManifestoResponse(ManifestoBase):
 
 # --- FastAPI App ---
 app = FastAPI()
+chart_cache = chart_cache_from_env()
+CHART_RETRY_AFTER_SECONDS = os.environ.get("CHART_RETRY_AFTER_SECONDS", "1")
+MAX_BATCH_ITEMS = int(os.environ.get("CHART_BATCH_MAX_ITEMS", 10_000))
+BATCH_CHUNK_SIZE = 16 # births per pool task in /calculate-charts
+BATCH_SATURATION_BACKOFF_SECONDS = 0.05
+CSV_WINDOW_SIZE = int(os.environ.get("CHART_CSV_WINDOW_SIZE", 64)) # rows in flight per CSV upload
+CSV_COLUMN_ALIASES = {"datetime": "datetime_utc", "lat": "latitude", "lon": "longitude", "lng": "longitude", "tz": "timezone_str", "timezone": "timezone_str"}
+
+def init_chart_worker():
+    """Opens per-process calculator resources; runs at import and in every pool worker."""
+    if os.environ.get("DESIGN_IMPRINT_DB_PATH"):
+        # Persist Design Imprint solutions so restarts and all workers share them
+        configure_design_imprint_memo(path=os.environ["DESIGN_IMPRINT_DB_PATH"])
+
+init_chart_worker()
+chart_executor = chart_executor_from_env(initializer=init_chart_worker)
 
 @app.on_event("startup")
 async def startup_event():
     # Base.metadata.create_all(bind=engine) # Alembic handles table creation/updates
     pass
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    chart_executor.shutdown()
+
 @app.get("/health")
 async def health_check():
     return {"status": "ok"}
@@ -289,92 +317,309 @@ async def generate_design(design_request: ManifestoCreate, db: Session = Depends
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {e}")
 
 
+def build_chart_response(birth_data_request: BirthDataRequest) -> HumanDesignChartResponse:
+    """Runs the full Human Design pipeline for one birth and builds the API response."""
+    # Create BirthData object for the library
+    birth_data_lib = BirthData(
+        datetime_utc=birth_data_request.datetime_utc,
+        latitude=birth_data_request.latitude,
+        longitude=birth_data_request.longitude,
+        timezone_str=birth_data_request.timezone_str
+    )
+
+    # 1. Get Planetary Positions (Personality Imprint)
+    personality_positions = get_planetary_positions(birth_data_lib)
+    personality_activations = []
+    for pos in personality_positions:
+        gate, line = map_degree_to_gate_and_line(pos.degree)
+        personality_activations.append(HDGateActivation(
+            gate=gate, line=line, planet=pos.planet, conscious=True
+        ))
+
+    # 2. Calculate Design Imprint Datetime (88 degrees solar arc)
+    design_dt = calculate_design_imprint_datetime(birth_data_lib)
+    design_birth_data_lib = BirthData(
+        datetime_utc=design_dt,
+        latitude=birth_data_request.latitude,
+        longitude=birth_data_request.longitude,
+        timezone_str=birth_data_request.timezone_str
+    )
+
+    # 3. Get Planetary Positions (Design Imprint)
+    design_positions = get_planetary_positions(design_birth_data_lib)
+    design_activations = []
+    for pos in design_positions:
+        gate, line = map_degree_to_gate_and_line(pos.degree)
+        design_activations.append(HDGateActivation(
+            gate=gate, line=line, planet=pos.planet, conscious=False
+        ))
+
+    # Combine all activations for channel/center calculation
+    all_activations = personality_activations + design_activations
+
+    # 4. Calculate Defined Channels
+    defined_channels = calculate_defined_channels(all_activations)
+
+    # 5. Calculate Defined Centers
+    defined_centers = calculate_defined_centers(defined_channels)
+
+    # 6. Determine Type and Strategy
+    chart_type, strategy = determine_type_and_strategy(defined_centers)
+
+    # 7. Determine Inner Authority
+    inner_authority = determine_inner_authority(defined_centers)
+
+    # 8. Determine Profile
+    profile = determine_profile(personality_activations, design_activations)
+
+    # 9. Determine Incarnation Cross
+    incarnation_cross = determine_incarnation_cross(personality_activations, design_activations)
+
+    # Construct response
+    response_personality_activations = [GateActivationResponse.from_hd_gate_activation(ga) for ga in personality_activations]
+    response_design_activations = [GateActivationResponse.from_hd_gate_activation(ga) for ga in design_activations]
+    response_defined_channels = [ChannelResponse.from_hd_channel(ch) for ch in defined_channels]
+    response_defined_centers = [DefinedCenterResponse.from_hd_defined_center(dc) for dc in defined_centers]
+
+    return HumanDesignChartResponse(
+        birth_data=birth_data_request,
+        personality_activations=response_personality_activations,
+        design_activations=response_design_activations,
+        defined_channels=response_defined_channels,
+        defined_centers=response_defined_centers,
+        type=chart_type,
+        strategy=strategy,
+        inner_authority=inner_authority,
+        profile=profile,
+        incarnation_cross=incarnation_cross
+    )
+
+
+def build_chart_responses(birth_data_requests: List[BirthDataRequest]) -> List[Union[HumanDesignChartResponse, Tuple[int, str]]]:
+    """
+    Runs build_chart_response for a chunk of births in one pool task.
+    A failed birth yields (status_code, detail) in its place instead of failing the chunk.
+    """
+    results = []
+    for birth_data_request in birth_data_requests:
+        try:
+            results.append(build_chart_response(birth_data_request))
+        except Exception as e:
+            error = chart_calculation_error(e)
+            results.append((error.status_code, error.detail))
+    return results
+
+
+def chart_calculation_error(e: Exception) -> HTTPException:
+    """Maps an exception raised by the chart pipeline to the HTTP error reported for it."""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, ChartExecutorSaturated):
+        return HTTPException(
+            status_code=503,
+            detail="Chart calculation capacity exceeded, please retry.",
+            headers={"Retry-After": CHART_RETRY_AFTER_SECONDS}
+        )
+    if isinstance(e, ChartExecutorTimeout):
+        return HTTPException(status_code=504, detail="Chart calculation timed out.")
+    if isinstance(e, ValueError):
+        return HTTPException(status_code=400, detail=f"Input error: {e}")
+    return HTTPException(status_code=500, detail=f"An unexpected error occurred during chart calculation: {e}")
+
+
+def chart_cache_key_for(birth_data_request: BirthDataRequest) -> str:
+    return make_chart_cache_key(
+        birth_data_request.datetime_utc,
+        birth_data_request.latitude,
+        birth_data_request.longitude,
+        birth_data_request.timezone_str
+    )
+
+
+def render_chart_json(chart: HumanDesignChartResponse) -> bytes:
+    """Serializes a chart to the exact bytes /calculate-chart responds with."""
+    return JSONResponse(content=chart.model_dump(mode="json")).body
+
+
+def render_ndjson_line(
+    index: int,
+    birth_data_request: Optional[BirthDataRequest],
+    result: Union[HumanDesignChartResponse, Tuple[int, Any]]
+) -> bytes:
+    """Renders one streamed batch result: {"index", "chart"} or {"index", "error"}."""
+    if isinstance(result, HumanDesignChartResponse):
+        chart = result.model_copy(update={"birth_data": birth_data_request})
+        return b'{"index":%d,"chart":%s}\n' % (index, render_chart_json(chart))
+    status_code, detail = result
+    error = {"index": index, "error": {"status_code": status_code, "detail": detail}}
+    return json.dumps(error, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+async def compute_chart_outcome(birth_data_request: BirthDataRequest) -> Union[HumanDesignChartResponse, Tuple[int, str]]:
+    """
+    Cached chart calculation on the pool for streaming endpoints: waits out saturation
+    instead of failing, and returns (status_code, detail) instead of raising.
+    """
+    cache_key = chart_cache_key_for(birth_data_request)
+    cached_chart = chart_cache.get(cache_key)
+    if cached_chart is not None:
+        return HumanDesignChartResponse.model_validate_json(cached_chart)
+    while True:
+        try:
+            chart = await chart_executor.run(build_chart_response, birth_data_request)
+            break
+        except ChartExecutorSaturated:
+            await asyncio.sleep(BATCH_SATURATION_BACKOFF_SECONDS)
+        except Exception as e:
+            error = chart_calculation_error(e)
+            return error.status_code, error.detail
+    chart_cache.set(cache_key, chart.model_dump_json())
+    return chart
+
+
+async def iter_csv_rows(byte_chunks: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    """Parses CSV rows out of a stream of byte chunks as the chunks arrive."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending_text = ""
+    async for chunk in byte_chunks:
+        pending_text += decoder.decode(chunk)
+        *lines, pending_text = pending_text.split("\n")
+        for row in csv.reader(lines):
+            yield row
+    pending_text += decoder.decode(b"", final=True)
+    if pending_text:
+        for row in csv.reader([pending_text]):
+            yield row
+
+
 @app.post("/calculate-chart", response_model=HumanDesignChartResponse)
 async def calculate_human_design_chart(
     birth_data_request: BirthDataRequest
 ):
-    try:
-        # Create BirthData object for the library
-        birth_data_lib = BirthData(
-            datetime_utc=birth_data_request.datetime_utc,
-            latitude=birth_data_request.latitude,
-            longitude=birth_data_request.longitude,
-            timezone_str=birth_data_request.timezone_str
-        )
+    cache_key = chart_cache_key_for(birth_data_request)
+    cached_chart = chart_cache.get(cache_key)
+    if cached_chart is not None:
+        # The key is rounded, so echo this request's birth data rather than the cached one
+        chart = HumanDesignChartResponse.model_validate_json(cached_chart)
+        return chart.model_copy(update={"birth_data": birth_data_request})
 
-        # 1. Get Planetary Positions (Personality Imprint)
-        personality_positions = get_planetary_positions(birth_data_lib)
-        personality_activations = []
-        for pos in personality_positions:
-            gate, line = map_degree_to_gate_and_line(pos.degree)
-            personality_activations.append(HDGateActivation(
-                gate=gate, line=line, planet=pos.planet, conscious=True
-            ))
-
-        # 2. Calculate Design Imprint Datetime (88 degrees solar arc)
-        design_dt = calculate_design_imprint_datetime(birth_data_lib)
-        design_birth_data_lib = BirthData(
-            datetime_utc=design_dt,
-            latitude=birth_data_request.latitude,
-            longitude=birth_data_request.longitude,
-            timezone_str=birth_data_request.timezone_str
-        )
+    try:
+        # Runs on the chart pool so the event loop keeps serving other requests
+        chart = await chart_executor.run(build_chart_response, birth_data_request)
+    except Exception as e:
+        raise chart_calculation_error(e)
 
-        # 3. Get Planetary Positions (Design Imprint)
-        design_positions = get_planetary_positions(design_birth_data_lib)
-        design_activations = []
-        for pos in design_positions:
-            gate, line = map_degree_to_gate_and_line(pos.degree)
-            design_activations.append(HDGateActivation(
-                gate=gate, line=line, planet=pos.planet, conscious=False
-            ))
-        
-        # Combine all activations for channel/center calculation
-        all_activations = personality_activations + design_activations
-
-        # 4. Calculate Defined Channels
-        defined_channels = calculate_defined_channels(all_activations)
-
-        # 5. Calculate Defined Centers
-        defined_centers = calculate_defined_centers(defined_channels)
-
-        # 6. Determine Type and Strategy
-        chart_type, strategy = determine_type_and_strategy(defined_centers)
-
-        # 7. Determine Inner Authority
-        inner_authority = determine_inner_authority(defined_centers)
-
-        # 8. Determine Profile
-        profile = determine_profile(personality_activations, design_activations)
-
-        # 9. Determine Incarnation Cross
-        incarnation_cross = determine_incarnation_cross(personality_activations, design_activations)
-
-        # Construct response
-        response_personality_activations = [GateActivationResponse.from_hd_gate_activation(ga) for ga in personality_activations]
-        response_design_activations = [GateActivationResponse.from_hd_gate_activation(ga) for ga in design_activations]
-        response_defined_channels = [ChannelResponse.from_hd_channel(ch) for ch in defined_channels]
-        response_defined_centers = [DefinedCenterResponse.from_hd_defined_center(dc) for dc in defined_centers]
-
-        return HumanDesignChartResponse(
-            birth_data=birth_data_request,
-            personality_activations=response_personality_activations,
-            design_activations=response_design_activations,
-            defined_channels=response_defined_channels,
-            defined_centers=response_defined_centers,
-            type=chart_type,
-            strategy=strategy,
-            inner_authority=inner_authority,
-            profile=profile,
-            incarnation_cross=incarnation_cross
-        )
+    chart_cache.set(cache_key, chart.model_dump_json())
+    return chart
 
-    except HTTPException:
-        raise # Re-raise FastAPI HTTPExceptions
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Input error: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred during chart calculation: {e}")
+@app.post("/calculate-charts")
+async def calculate_human_design_charts(
+    birth_data_requests: List[BirthDataRequest]
+):
+    """
+    Calculates many charts in one request, streamed back as NDJSON in input order.
+    Each line is {"index": i, "chart": {...}} with the same chart bytes /calculate-chart returns,
+    or {"index": i, "error": {"status_code": ..., "detail": ...}}. Identical births are computed once.
+    """
+    if len(birth_data_requests) > MAX_BATCH_ITEMS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BATCH_ITEMS} births per batch.")
+
+    loop = asyncio.get_running_loop()
+    cache_keys = [chart_cache_key_for(r) for r in birth_data_requests]
+    outcomes: Dict[str, asyncio.Future] = {}
+    pending = []
+    for cache_key, birth_data_request in zip(cache_keys, birth_data_requests):
+        if cache_key in outcomes:
+            continue
+        outcomes[cache_key] = loop.create_future()
+        cached_chart = chart_cache.get(cache_key)
+        if cached_chart is not None:
+            outcomes[cache_key].set_result(HumanDesignChartResponse.model_validate_json(cached_chart))
+        else:
+            pending.append((cache_key, birth_data_request))
+
+    # One chunk per pool task; at most one chunk per worker in flight so single-chart traffic still gets through
+    slots = asyncio.Semaphore(chart_executor.max_workers)
+
+    async def compute_chunk(chunk):
+        async with slots:
+            while True:
+                try:
+                    results = await chart_executor.run(build_chart_responses, [r for _, r in chunk])
+                    break
+                except ChartExecutorSaturated:
+                    await asyncio.sleep(BATCH_SATURATION_BACKOFF_SECONDS)
+                except Exception as e:
+                    error = chart_calculation_error(e)
+                    results = [(error.status_code, error.detail)] * len(chunk)
+                    break
+        for (cache_key, _), result in zip(chunk, results):
+            if isinstance(result, HumanDesignChartResponse):
+                chart_cache.set(cache_key, result.model_dump_json())
+            outcomes[cache_key].set_result(result)
+
+    tasks = [
+        asyncio.ensure_future(compute_chunk(pending[i:i + BATCH_CHUNK_SIZE]))
+        for i in range(0, len(pending), BATCH_CHUNK_SIZE)
+    ]
+
+    async def stream_results():
+        try:
+            for index, (cache_key, birth_data_request) in enumerate(zip(cache_keys, birth_data_requests)):
+                yield render_ndjson_line(index, birth_data_request, await outcomes[cache_key])
+        finally:
+            for task in tasks:
+                task.cancel() # The client went away; stop dispatching chunks
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.post("/calculate-charts/csv")
+async def calculate_human_design_charts_csv(request: Request):
+    """
+    Calculates a chart for every row of a CSV request body (text/csv), streamed back as NDJSON
+    in the same format as /calculate-charts. The first row is a header naming the
+    datetime_utc, latitude, longitude and timezone_str columns (or datetime, lat, lon, tz).
+
+    The body is parsed as it arrives and at most CSV_WINDOW_SIZE rows are in flight,
+    so memory stays flat regardless of file size.
+    """
+    async def stream_results():
+        in_flight = deque()
+        try:
+            index = 0
+            header = None
+            async for row in iter_csv_rows(request.stream()):
+                if not row:
+                    continue
+                if header is None:
+                    header = [CSV_COLUMN_ALIASES.get(name.strip().lower(), name.strip().lower()) for name in row]
+                    continue
+                try:
+                    birth_data_request = BirthDataRequest(**dict(zip(header, row)))
+                    outcome = asyncio.ensure_future(compute_chart_outcome(birth_data_request))
+                except ValidationError as e:
+                    birth_data_request = None
+                    outcome = asyncio.get_running_loop().create_future()
+                    outcome.set_result((422, [{"loc": list(err["loc"]), "msg": err["msg"]} for err in e.errors()]))
+                in_flight.append((index, birth_data_request, outcome))
+                index += 1
+
+                while in_flight and (in_flight[0][2].done() or len(in_flight) >= CSV_WINDOW_SIZE):
+                    row_index, row_request, row_outcome = in_flight.popleft()
+                    yield render_ndjson_line(row_index, row_request, await row_outcome)
+
+            while in_flight:
+                row_index, row_request, row_outcome = in_flight.popleft()
+                yield render_ndjson_line(row_index, row_request, await row_outcome)
+        finally:
+            for _, _, row_outcome in in_flight:
+                row_outcome.cancel() # The client went away
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+@app.get("/chart-cache/stats")
+async def chart_cache_stats():
+    return chart_cache.stats()
 
 # Example: Read all manifestos
 @app.get("/manifestos", response_model=List[ManifestoResponse])
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from chart_cache import ChartCache, make_chart_cache_key
+
+
+class TestChartCache(unittest.TestCase):
+
+    def test_make_chart_cache_key(self):
+        aware = datetime(1984, 1, 11, 12, 0, 0, tzinfo=timezone.utc)
+        naive = datetime(1984, 1, 11, 12, 0, 0)
+        plus_one = datetime(1984, 1, 11, 13, 0, 0, tzinfo=timezone(timedelta(hours=1)))
+        key = make_chart_cache_key(aware, 51.5074, 0.1278, "Europe/London")
+
+        self.assertEqual(key, make_chart_cache_key(naive, 51.5074, 0.1278, "Europe/London"))
+        self.assertEqual(key, make_chart_cache_key(plus_one, 51.5074, 0.1278, "Europe/London"))
+        self.assertEqual(key, make_chart_cache_key(aware + timedelta(microseconds=500), 51.50740001, 0.1278, "Europe/London"))
+        self.assertNotEqual(key, make_chart_cache_key(aware + timedelta(seconds=1), 51.5074, 0.1278, "Europe/London"))
+        self.assertNotEqual(key, make_chart_cache_key(aware, 51.5074, 0.1278, "UTC"))
+
+    def test_lru_eviction_by_entries_and_size(self):
+        cache = ChartCache(max_entries=2, max_bytes=10)
+        cache.set("a", "111")
+        cache.set("b", "222")
+        self.assertEqual(cache.get("a"), "111") # "b" is now least recently used
+        cache.set("c", "333")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "333")
+
+        cache.set("d", "x" * 8) # 3 + 8 bytes exceeds max_bytes
+        self.assertEqual(cache.stats()["entries"], 1)
+        self.assertEqual(cache.stats()["evictions"], 3)
+
+    def test_ttl_expiry(self):
+        cache = ChartCache(ttl_seconds=60)
+        with mock.patch("chart_cache.time.time", return_value=1000.0):
+            cache.set("a", "value")
+        with mock.patch("chart_cache.time.time", return_value=1030.0):
+            self.assertEqual(cache.get("a"), "value")
+        with mock.patch("chart_cache.time.time", return_value=1061.0):
+            self.assertIsNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((stats["memory_hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+
+    def test_disk_tier_is_shared(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "chart_cache.db")
+            ChartCache(disk_path=path).set("a", "value")
+
+            other_worker = ChartCache(disk_path=path)
+            self.assertEqual(other_worker.get("a"), "value")
+            self.assertEqual(other_worker.get("a"), "value")
+            stats = other_worker.stats()
+            self.assertEqual((stats["disk_hits"], stats["memory_hits"]), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
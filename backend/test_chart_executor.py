@@ -0,0 +1,59 @@
+import asyncio
+import threading
+import unittest
+
+from chart_executor import ChartExecutor, ChartExecutorSaturated, ChartExecutorTimeout
+
+
+def _square(x):
+    return x * x
+
+
+def _fail():
+    raise ValueError("bad birth data")
+
+
+class TestChartExecutor(unittest.TestCase):
+
+    def test_runs_on_pool_and_propagates_errors(self):
+        for kind in ("thread", "process"):
+            executor = ChartExecutor(kind=kind, max_workers=2)
+            try:
+                self.assertEqual(asyncio.run(executor.run(_square, 7)), 49)
+                with self.assertRaises(ValueError):
+                    asyncio.run(executor.run(_fail))
+            finally:
+                executor.shutdown()
+
+    def test_saturation_and_timeout(self):
+        release = threading.Event()
+        executor = ChartExecutor(kind="thread", max_workers=1, max_pending=2, timeout_seconds=0.05)
+
+        async def scenario():
+            blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+            await asyncio.sleep(0) # Let both calls be admitted
+            with self.assertRaises(ChartExecutorSaturated):
+                await executor.run(_square, 2)
+            for call in blocked:
+                with self.assertRaises(ChartExecutorTimeout):
+                    await call
+            # Timed-out work still occupies its slots until the workers finish
+            self.assertEqual(executor.pending, 2)
+            release.set()
+            while executor.pending:
+                await asyncio.sleep(0.01)
+            self.assertEqual(await executor.run(_square, 3), 9)
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_unknown_kind(self):
+        with self.assertRaises(ValueError):
+            ChartExecutor(kind="gpu")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+os.environ.setdefault("CHART_EXECUTOR", "thread")
+
+from fastapi.testclient import TestClient
+
+import main
+from chart_executor import ChartExecutorSaturated
+
+
+class TestChartEndpoints(unittest.TestCase):
+
+    def setUp(self):
+        main.chart_cache.clear()
+        self.client = TestClient(main.app)
+        self.birth = {
+            "datetime_utc": "1984-01-11T12:00:00Z",
+            "latitude": 51.5074,
+            "longitude": 0.1278,
+            "timezone_str": "Europe/London",
+        }
+        self.other_birth = dict(self.birth, datetime_utc="1990-05-05T05:05:00Z")
+
+    def test_calculate_chart_backpressure(self):
+        with mock.patch.object(main.chart_executor, "run", side_effect=ChartExecutorSaturated()):
+            response = self.client.post("/calculate-chart", json=self.birth)
+        self.assertEqual(response.status_code, 503)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_calculate_charts_matches_single_endpoint(self):
+        failing_birth = dict(self.birth, latitude=-1.0)
+        original = main.build_chart_response
+
+        def build_or_fail(birth_data_request):
+            if birth_data_request.latitude == -1.0:
+                raise ValueError("bad birth")
+            return original(birth_data_request)
+
+        misses_before = main.chart_cache.stats()["misses"]
+        with mock.patch("main.build_chart_response", side_effect=build_or_fail):
+            response = self.client.post("/calculate-charts", json=[self.birth, self.other_birth, failing_birth, self.birth])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        lines = response.content.splitlines()
+        self.assertEqual([json.loads(line)["index"] for line in lines], [0, 1, 2, 3])
+        # The repeated birth was computed once
+        self.assertEqual(main.chart_cache.stats()["misses"] - misses_before, 3)
+
+        self.assertEqual(json.loads(lines[2])["error"], {"status_code": 400, "detail": "Input error: bad birth"})
+        for line, birth in ((lines[0], self.birth), (lines[1], self.other_birth), (lines[3], self.birth)):
+            single = self.client.post("/calculate-chart", json=birth).content
+            self.assertEqual(line, b'{"index":%d,"chart":%s}' % (json.loads(line)["index"], single))
+
+    def test_calculate_charts_csv(self):
+        csv_body = (
+            "datetime,lat,lon,tz\r\n"
+            "1984-01-11T12:00:00Z,51.5074,0.1278,Europe/London\r\n"
+            "not-a-date,51.5074,0.1278,Europe/London\r\n"
+            "\r\n"
+            "1990-05-05T05:05:00Z,51.5074,0.1278,Europe/London"
+        )
+        response = self.client.post("/calculate-charts/csv", content=csv_body.encode(), headers={"Content-Type": "text/csv"})
+        self.assertEqual(response.status_code, 200)
+        lines = [json.loads(line) for line in response.content.splitlines()]
+        self.assertEqual([line["index"] for line in lines], [0, 1, 2])
+        self.assertEqual(lines[1]["error"]["status_code"], 422)
+        self.assertEqual(lines[0]["chart"], self.client.post("/calculate-chart", json=self.birth).json())
+        self.assertEqual(lines[2]["chart"], self.client.post("/calculate-chart", json=self.other_birth).json())
+
+
+if __name__ == '__main__':
+    unittest.main()